@@ -2,33 +2,102 @@ from __future__ import annotations
 
 import json
 import sqlite3
-from datetime import datetime, timezone
-from typing import Any
+import threading
+from contextlib import contextmanager
+from typing import Any, Iterator
 
 from .settings import DB_PATH
 
+# Per-connection tuning; safe defaults for a WAL-mode database.
+_PRAGMAS = """
+PRAGMA synchronous=NORMAL;
+PRAGMA temp_store=MEMORY;
+PRAGMA cache_size=-65536;
+PRAGMA mmap_size=268435456;
+PRAGMA busy_timeout=5000;
+PRAGMA wal_autocheckpoint=1000;
+"""
 
-def utc_now_iso() -> str:
-    return datetime.now(timezone.utc).isoformat()
+# journal_mode=WAL is persistent in the database file, so it only needs to be set once.
+_wal_enabled = False
+
+# sqlite3 connections must not be shared across threads, so each thread
+# (FastAPI worker, scheduler, background scan, db writer) keeps its own
+# read-only connection and, if it writes, one read-write connection.
+_local = threading.local()
+
+
+# UTC ISO-8601 timestamps computed by SQLite. They keep the +00:00 suffix of the previously
+# stored datetime.isoformat() values but carry milliseconds (%f) instead of microseconds,
+# so string comparisons against old rows are ordered to the millisecond.
+_TS_FORMAT = "%Y-%m-%dT%H:%M:%f+00:00"
+_NOW_SQL = f"strftime('{_TS_FORMAT}', 'now')"
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=True, separators=(",", ":"))
 
 
 def _connect() -> sqlite3.Connection:
+    global _wal_enabled
     DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    # Autocommit mode: write paths open their own BEGIN IMMEDIATE via _transaction()
+    conn = sqlite3.connect(DB_PATH, isolation_level=None, cached_statements=256)
+    if not _wal_enabled:
+        conn.execute("PRAGMA journal_mode=WAL")
+        _wal_enabled = True
+    conn.executescript(_PRAGMAS)
+    return conn
+
+
+def _connect_read() -> sqlite3.Connection:
+    # Under WAL, read-only connections never block on (or block) the writer.
+    conn = sqlite3.connect(
+        f"{DB_PATH.as_uri()}?mode=ro", uri=True, isolation_level=None, cached_statements=256
+    )
+    conn.executescript(_PRAGMAS)
     return conn
 
 
+def _get_conn() -> sqlite3.Connection:
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = _connect()
+        _local.conn = conn
+    return conn
+
+
+def _read_conn() -> sqlite3.Connection:
+    conn = getattr(_local, "read_conn", None)
+    if conn is None:
+        conn = _connect_read()
+        _local.read_conn = conn
+    return conn
+
+
+@contextmanager
+def _transaction() -> Iterator[sqlite3.Cursor]:
+    """Run a write batch inside BEGIN IMMEDIATE so lock contention surfaces up front."""
+    conn = _get_conn()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn.cursor()
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
 def init_db() -> None:
-    conn = _connect()
+    conn = _get_conn()
     cur = conn.cursor()
 
     cur.execute(
-        """
+        f"""
         CREATE TABLE IF NOT EXISTS runs (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             run_type TEXT NOT NULL,
-            started_at TEXT NOT NULL,
+            started_at TEXT NOT NULL DEFAULT ({_NOW_SQL}),
             completed_at TEXT,
             status TEXT NOT NULL,
             rules_snapshot TEXT NOT NULL,
@@ -39,7 +108,7 @@ def init_db() -> None:
     )
 
     cur.execute(
-        """
+        f"""
         CREATE TABLE IF NOT EXISTS recommendations (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             run_id INTEGER NOT NULL,
@@ -54,14 +123,19 @@ def init_db() -> None:
             score_breakdown_json TEXT NOT NULL,
             reasons_json TEXT NOT NULL,
             event_count INTEGER NOT NULL,
-            metrics_json TEXT NOT NULL DEFAULT '{}',
-            created_at TEXT NOT NULL,
+            metrics_json TEXT NOT NULL DEFAULT '{{}}',
+            created_at TEXT NOT NULL DEFAULT ({_NOW_SQL}),
             FOREIGN KEY (run_id) REFERENCES runs(id)
         )
         """
     )
 
-    cur.execute("CREATE INDEX IF NOT EXISTS idx_recommendations_run_id ON recommendations(run_id)")
+    # Covers both the run_id lookup and the rank ordering used by get_recommendations
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_recommendations_run_rank "
+        "ON recommendations(run_id, rank ASC, final_score DESC)"
+    )
+    cur.execute("DROP INDEX IF EXISTS idx_recommendations_run_id")
 
     # Add metrics_json column if missing (for existing DBs)
     try:
@@ -71,7 +145,7 @@ def init_db() -> None:
 
     # Fundamentals cache — stores everything except live price
     cur.execute(
-        """
+        f"""
         CREATE TABLE IF NOT EXISTS stock_cache (
             symbol TEXT PRIMARY KEY,
             name TEXT NOT NULL,
@@ -88,231 +162,277 @@ def init_db() -> None:
             promoter_holding_pct REAL NOT NULL,
             pledge_pct REAL NOT NULL,
             hni_net_buying_cr REAL NOT NULL,
-            metrics_json TEXT NOT NULL DEFAULT '{}',
-            fetched_at TEXT NOT NULL
+            metrics_json TEXT NOT NULL DEFAULT '{{}}',
+            fetched_at TEXT NOT NULL DEFAULT ({_NOW_SQL})
         )
         """
     )
 
-    conn.commit()
-    conn.close()
+
+# INSERT ... RETURNING needs SQLite 3.35+; older builds fall back to lastrowid.
+_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35)
+
+_INSERT_RUN_SQL = f"""
+INSERT INTO runs (run_type, started_at, status, rules_snapshot)
+VALUES (?, {_NOW_SQL}, ?, ?)
+"""
+_INSERT_RUN_RETURNING_SQL = _INSERT_RUN_SQL + "RETURNING id"
 
 
 def create_run(run_type: str, rules_snapshot: dict[str, Any]) -> int:
-    conn = _connect()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        INSERT INTO runs (run_type, started_at, status, rules_snapshot)
-        VALUES (?, ?, ?, ?)
-        """,
-        (
-            run_type,
-            utc_now_iso(),
-            "running",
-            json.dumps(rules_snapshot, ensure_ascii=True),
-        ),
-    )
-    run_id = int(cur.lastrowid)
-    conn.commit()
-    conn.close()
+    params = (run_type, "running", _dumps(rules_snapshot))
+    with _transaction() as cur:
+        if _HAS_RETURNING:
+            run_id = int(cur.execute(_INSERT_RUN_RETURNING_SQL, params).fetchone()[0])
+        else:
+            cur.execute(_INSERT_RUN_SQL, params)
+            run_id = int(cur.lastrowid)
     return run_id
 
 
 def complete_run(run_id: int, summary: dict[str, Any]) -> None:
-    conn = _connect()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        UPDATE runs
-        SET completed_at = ?, status = ?, summary_json = ?
-        WHERE id = ?
-        """,
-        (utc_now_iso(), "completed", json.dumps(summary, ensure_ascii=True), run_id),
-    )
-    conn.commit()
-    conn.close()
+    with _transaction() as cur:
+        cur.execute(
+            f"""
+            UPDATE runs
+            SET completed_at = {_NOW_SQL}, status = ?, summary_json = ?
+            WHERE id = ?
+            """,
+            ("completed", _dumps(summary), run_id),
+        )
 
 
 def fail_run(run_id: int, error_text: str) -> None:
-    conn = _connect()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        UPDATE runs
-        SET completed_at = ?, status = ?, error_text = ?
-        WHERE id = ?
-        """,
-        (utc_now_iso(), "failed", error_text, run_id),
-    )
-    conn.commit()
-    conn.close()
+    with _transaction() as cur:
+        cur.execute(
+            f"""
+            UPDATE runs
+            SET completed_at = {_NOW_SQL}, status = ?, error_text = ?
+            WHERE id = ?
+            """,
+            ("failed", error_text, run_id),
+        )
 
 
 def insert_recommendations(run_id: int, rows: list[dict[str, Any]]) -> None:
-    conn = _connect()
-    cur = conn.cursor()
-
-    payload = []
-    for row in rows:
-        payload.append(
+    with _transaction() as cur:
+        cur.executemany(
+            f"""
+            INSERT INTO recommendations (
+                run_id, rank, symbol, name, exchange, sector, market_cap_cr, pe,
+                final_score, score_breakdown_json, reasons_json, event_count,
+                metrics_json, created_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, {_NOW_SQL})
+            """,
             (
-                run_id,
-                row["rank"],
-                row["symbol"],
-                row["name"],
-                row["exchange"],
-                row["sector"],
-                float(row["market_cap_cr"]),
-                float(row["pe"]),
-                float(row["final_score"]),
-                json.dumps(row["score_breakdown"], ensure_ascii=True),
-                json.dumps(row["reasons"], ensure_ascii=True),
-                int(row["event_count"]),
-                json.dumps(row.get("metrics", {}), ensure_ascii=True),
-                utc_now_iso(),
-            )
+                (
+                    run_id,
+                    row["rank"],
+                    row["symbol"],
+                    row["name"],
+                    row["exchange"],
+                    row["sector"],
+                    float(row["market_cap_cr"]),
+                    float(row["pe"]),
+                    float(row["final_score"]),
+                    _dumps(row["score_breakdown"]),
+                    _dumps(row["reasons"]),
+                    int(row["event_count"]),
+                    _dumps(row.get("metrics", {})),
+                )
+                for row in rows
+            ),
         )
 
-    cur.executemany(
-        """
-        INSERT INTO recommendations (
-            run_id, rank, symbol, name, exchange, sector, market_cap_cr, pe,
-            final_score, score_breakdown_json, reasons_json, event_count,
-            metrics_json, created_at
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-        payload,
-    )
 
-    conn.commit()
-    conn.close()
+_RUN_COLUMNS = "id, run_type, started_at, completed_at, status, rules_snapshot, summary_json, error_text"
+
+_RECOMMENDATION_COLUMNS = (
+    "id, run_id, rank, symbol, name, exchange, sector, market_cap_cr, pe, final_score, "
+    "score_breakdown_json, reasons_json, event_count, metrics_json, created_at"
+)
 
+# Read statements are fixed strings so each connection's statement cache reuses them.
+_SELECT_LATEST_RUN_SQL = f"SELECT {_RUN_COLUMNS} FROM runs ORDER BY id DESC LIMIT 1"
+_SELECT_RUNS_SQL = f"SELECT {_RUN_COLUMNS} FROM runs ORDER BY id DESC LIMIT ?"
+_SELECT_RUN_SQL = f"SELECT {_RUN_COLUMNS} FROM runs WHERE id = ?"
+_SELECT_RECOMMENDATIONS_SQL = (
+    f"SELECT {_RECOMMENDATION_COLUMNS} FROM recommendations "
+    "WHERE run_id = ? ORDER BY rank ASC, final_score DESC"
+)
 
-def _parse_run(row: sqlite3.Row) -> dict[str, Any]:
+
+def _parse_run(row: tuple) -> dict[str, Any]:
+    id_, run_type, started_at, completed_at, status, rules_snapshot, summary_json, error_text = row
     return {
-        "id": row["id"],
-        "run_type": row["run_type"],
-        "started_at": row["started_at"],
-        "completed_at": row["completed_at"],
-        "status": row["status"],
-        "rules_snapshot": json.loads(row["rules_snapshot"]),
-        "summary": json.loads(row["summary_json"]) if row["summary_json"] else None,
-        "error_text": row["error_text"],
+        "id": id_,
+        "run_type": run_type,
+        "started_at": started_at,
+        "completed_at": completed_at,
+        "status": status,
+        "rules_snapshot": json.loads(rules_snapshot),
+        "summary": json.loads(summary_json) if summary_json else None,
+        "error_text": error_text,
     }
 
 
-def _parse_recommendation(row: sqlite3.Row) -> dict[str, Any]:
-    metrics_raw = row["metrics_json"] if "metrics_json" in row.keys() else "{}"
+def _parse_recommendation(row: tuple) -> dict[str, Any]:
+    (
+        id_, run_id, rank, symbol, name, exchange, sector, market_cap_cr, pe, final_score,
+        score_breakdown_json, reasons_json, event_count, metrics_json, created_at,
+    ) = row
     return {
-        "id": row["id"],
-        "run_id": row["run_id"],
-        "rank": row["rank"],
-        "symbol": row["symbol"],
-        "name": row["name"],
-        "exchange": row["exchange"],
-        "sector": row["sector"],
-        "market_cap_cr": row["market_cap_cr"],
-        "pe": row["pe"],
-        "final_score": row["final_score"],
-        "score_breakdown": json.loads(row["score_breakdown_json"]),
-        "reasons": json.loads(row["reasons_json"]),
-        "event_count": row["event_count"],
-        "metrics": json.loads(metrics_raw) if metrics_raw else {},
-        "created_at": row["created_at"],
+        "id": id_,
+        "run_id": run_id,
+        "rank": rank,
+        "symbol": symbol,
+        "name": name,
+        "exchange": exchange,
+        "sector": sector,
+        "market_cap_cr": market_cap_cr,
+        "pe": pe,
+        "final_score": final_score,
+        "score_breakdown": json.loads(score_breakdown_json),
+        "reasons": json.loads(reasons_json),
+        "event_count": event_count,
+        "metrics": json.loads(metrics_json) if metrics_json else {},
+        "created_at": created_at,
     }
 
 
 def get_latest_run() -> dict[str, Any] | None:
-    conn = _connect()
+    conn = _read_conn()
     cur = conn.cursor()
-    cur.execute("SELECT * FROM runs ORDER BY id DESC LIMIT 1")
+    cur.execute(_SELECT_LATEST_RUN_SQL)
     row = cur.fetchone()
-    conn.close()
     if not row:
         return None
     return _parse_run(row)
 
 
 def list_runs(limit: int = 30) -> list[dict[str, Any]]:
-    conn = _connect()
+    conn = _read_conn()
     cur = conn.cursor()
-    cur.execute("SELECT * FROM runs ORDER BY id DESC LIMIT ?", (limit,))
+    cur.execute(_SELECT_RUNS_SQL, (limit,))
     rows = cur.fetchall()
-    conn.close()
     return [_parse_run(r) for r in rows]
 
 
 def get_run(run_id: int) -> dict[str, Any] | None:
-    conn = _connect()
+    conn = _read_conn()
     cur = conn.cursor()
-    cur.execute("SELECT * FROM runs WHERE id = ?", (run_id,))
+    cur.execute(_SELECT_RUN_SQL, (run_id,))
     row = cur.fetchone()
-    conn.close()
     if not row:
         return None
     return _parse_run(row)
 
 
 def get_recommendations(run_id: int) -> list[dict[str, Any]]:
-    conn = _connect()
+    conn = _read_conn()
     cur = conn.cursor()
-    cur.execute(
-        "SELECT * FROM recommendations WHERE run_id = ? ORDER BY rank ASC, final_score DESC",
-        (run_id,),
-    )
+    cur.execute(_SELECT_RECOMMENDATIONS_SQL, (run_id,))
     rows = cur.fetchall()
-    conn.close()
     return [_parse_recommendation(r) for r in rows]
 
 
-# ── Stock fundamentals cache ──────────────────────────────────────
+def get_run_with_recs(run_id: int) -> dict[str, Any] | None:
+    """Fetch a run and its recommendations from one snapshot of the database."""
+    conn = _read_conn()
+    cur = conn.cursor()
+    cur.execute("BEGIN")
+    try:
+        row = cur.execute(_SELECT_RUN_SQL, (run_id,)).fetchone()
+        rec_rows = cur.execute(_SELECT_RECOMMENDATIONS_SQL, (run_id,)).fetchall() if row else []
+    finally:
+        cur.execute("COMMIT")
+    if not row:
+        return None
+    return {"run": _parse_run(row), "recommendations": [_parse_recommendation(r) for r in rec_rows]}
+
 
+# ── Stock fundamentals cache ──────────────────────────────────────
 
-def get_cached_fundamentals(symbols: list[str], max_age_days: int = 90) -> dict[str, dict[str, Any]]:
-    """Return cached fundamentals for symbols that are fresh enough."""
+_CACHE_COLUMNS = (
+    "symbol, name, exchange, sector, market_cap_cr, pe, "
+    "profit_ttm_cr, profit_prev_ttm_cr, "
+    "profit_q1_cr, profit_q2_cr, profit_q3_cr, profit_q4_cr, "
+    "promoter_holding_pct, pledge_pct, hni_net_buying_cr, "
+    "metrics_json, fetched_at"
+)
+
+_UPSERT_CACHE_SQL = f"""
+INSERT INTO stock_cache ({_CACHE_COLUMNS})
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, {_NOW_SQL})
+ON CONFLICT(symbol) DO UPDATE SET
+    name=excluded.name,
+    exchange=excluded.exchange,
+    sector=excluded.sector,
+    market_cap_cr=excluded.market_cap_cr,
+    pe=excluded.pe,
+    profit_ttm_cr=excluded.profit_ttm_cr,
+    profit_prev_ttm_cr=excluded.profit_prev_ttm_cr,
+    profit_q1_cr=excluded.profit_q1_cr,
+    profit_q2_cr=excluded.profit_q2_cr,
+    profit_q3_cr=excluded.profit_q3_cr,
+    profit_q4_cr=excluded.profit_q4_cr,
+    promoter_holding_pct=excluded.promoter_holding_pct,
+    pledge_pct=excluded.pledge_pct,
+    hni_net_buying_cr=excluded.hni_net_buying_cr,
+    metrics_json=excluded.metrics_json,
+    fetched_at=excluded.fetched_at
+"""
+
+# Symbols are bound as one JSON array so the statement text is constant regardless of
+# universe size (and stays clear of SQLite's bound-parameter limit). fetched_at is stored
+# as a UTC ISO-8601 string, so freshness is a plain string compare against a cutoff
+# SQLite computes from a "-N days" modifier.
+_SELECT_CACHED_SQL = f"""
+SELECT {_CACHE_COLUMNS} FROM stock_cache
+WHERE symbol IN (SELECT value FROM json_each(?))
+  AND fetched_at >= strftime('{_TS_FORMAT}', 'now', ?)
+"""
+
+
+def get_cached_fundamentals(
+    symbols: list[str], max_age_days: int = 90
+) -> dict[str, tuple[dict[str, Any], str]]:
+    """Return (fundamentals, fetched_at) for symbols that are fresh enough."""
     if not symbols:
         return {}
-    conn = _connect()
+    conn = _read_conn()
     cur = conn.cursor()
-    placeholders = ",".join("?" for _ in symbols)
-    cur.execute(f"SELECT * FROM stock_cache WHERE symbol IN ({placeholders})", symbols)
+    cur.execute(_SELECT_CACHED_SQL, (_dumps(symbols), f"-{int(max_age_days)} days"))
     rows = cur.fetchall()
-    conn.close()
-
-    from datetime import datetime, timedelta, timezone
-
-    cutoff = datetime.now(timezone.utc) - timedelta(days=max_age_days)
-    result: dict[str, dict[str, Any]] = {}
 
+    result: dict[str, tuple[dict[str, Any], str]] = {}
     for row in rows:
-        fetched_at_str = row["fetched_at"]
-        try:
-            fetched_at = datetime.fromisoformat(fetched_at_str)
-            if fetched_at.tzinfo is None:
-                fetched_at = fetched_at.replace(tzinfo=timezone.utc)
-        except (ValueError, TypeError):
-            continue
-        if fetched_at < cutoff:
-            continue
-        result[row["symbol"]] = {
-            "symbol": row["symbol"],
-            "name": row["name"],
-            "exchange": row["exchange"],
-            "sector": row["sector"],
-            "market_cap_cr": row["market_cap_cr"],
-            "pe": row["pe"],
-            "profit_ttm_cr": row["profit_ttm_cr"],
-            "profit_prev_ttm_cr": row["profit_prev_ttm_cr"],
-            "profit_q1_cr": row["profit_q1_cr"],
-            "profit_q2_cr": row["profit_q2_cr"],
-            "profit_q3_cr": row["profit_q3_cr"],
-            "profit_q4_cr": row["profit_q4_cr"],
-            "promoter_holding_pct": row["promoter_holding_pct"],
-            "pledge_pct": row["pledge_pct"],
-            "hni_net_buying_cr": row["hni_net_buying_cr"],
-            "metrics": json.loads(row["metrics_json"]) if row["metrics_json"] else {},
+        (
+            symbol, name, exchange, sector, market_cap_cr, pe,
+            profit_ttm_cr, profit_prev_ttm_cr,
+            profit_q1_cr, profit_q2_cr, profit_q3_cr, profit_q4_cr,
+            promoter_holding_pct, pledge_pct, hni_net_buying_cr,
+            metrics_json, fetched_at,
+        ) = row
+        entry = {
+            "symbol": symbol,
+            "name": name,
+            "exchange": exchange,
+            "sector": sector,
+            "market_cap_cr": market_cap_cr,
+            "pe": pe,
+            "profit_ttm_cr": profit_ttm_cr,
+            "profit_prev_ttm_cr": profit_prev_ttm_cr,
+            "profit_q1_cr": profit_q1_cr,
+            "profit_q2_cr": profit_q2_cr,
+            "profit_q3_cr": profit_q3_cr,
+            "profit_q4_cr": profit_q4_cr,
+            "promoter_holding_pct": promoter_holding_pct,
+            "pledge_pct": pledge_pct,
+            "hni_net_buying_cr": hni_net_buying_cr,
+            "metrics": json.loads(metrics_json) if metrics_json else {},
         }
+        result[symbol] = (entry, fetched_at)
     return result
 
 
@@ -320,55 +440,26 @@ def upsert_fundamentals_cache(entries: list[dict[str, Any]]) -> None:
     """Insert or update fundamentals cache entries."""
     if not entries:
         return
-    conn = _connect()
-    cur = conn.cursor()
-    for e in entries:
-        cur.execute(
-            """
-            INSERT INTO stock_cache (
-                symbol, name, exchange, sector, market_cap_cr, pe,
-                profit_ttm_cr, profit_prev_ttm_cr,
-                profit_q1_cr, profit_q2_cr, profit_q3_cr, profit_q4_cr,
-                promoter_holding_pct, pledge_pct, hni_net_buying_cr,
-                metrics_json, fetched_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ON CONFLICT(symbol) DO UPDATE SET
-                name=excluded.name,
-                exchange=excluded.exchange,
-                sector=excluded.sector,
-                market_cap_cr=excluded.market_cap_cr,
-                pe=excluded.pe,
-                profit_ttm_cr=excluded.profit_ttm_cr,
-                profit_prev_ttm_cr=excluded.profit_prev_ttm_cr,
-                profit_q1_cr=excluded.profit_q1_cr,
-                profit_q2_cr=excluded.profit_q2_cr,
-                profit_q3_cr=excluded.profit_q3_cr,
-                profit_q4_cr=excluded.profit_q4_cr,
-                promoter_holding_pct=excluded.promoter_holding_pct,
-                pledge_pct=excluded.pledge_pct,
-                hni_net_buying_cr=excluded.hni_net_buying_cr,
-                metrics_json=excluded.metrics_json,
-                fetched_at=excluded.fetched_at
-            """,
-            (
-                e["symbol"],
-                e["name"],
-                e["exchange"],
-                e["sector"],
-                float(e["market_cap_cr"]),
-                float(e["pe"]),
-                float(e["profit_ttm_cr"]),
-                float(e["profit_prev_ttm_cr"]),
-                float(e["profit_q1_cr"]),
-                float(e["profit_q2_cr"]),
-                float(e["profit_q3_cr"]),
-                float(e["profit_q4_cr"]),
-                float(e["promoter_holding_pct"]),
-                float(e["pledge_pct"]),
-                float(e["hni_net_buying_cr"]),
-                json.dumps(e.get("metrics", {}), ensure_ascii=True),
-                utc_now_iso(),
-            ),
+    payload = (
+        (
+            e["symbol"],
+            e["name"],
+            e["exchange"],
+            e["sector"],
+            float(e["market_cap_cr"]),
+            float(e["pe"]),
+            float(e["profit_ttm_cr"]),
+            float(e["profit_prev_ttm_cr"]),
+            float(e["profit_q1_cr"]),
+            float(e["profit_q2_cr"]),
+            float(e["profit_q3_cr"]),
+            float(e["profit_q4_cr"]),
+            float(e["promoter_holding_pct"]),
+            float(e["pledge_pct"]),
+            float(e["hni_net_buying_cr"]),
+            _dumps(e.get("metrics", {})),
         )
-    conn.commit()
-    conn.close()
+        for e in entries
+    )
+    with _transaction() as cur:
+        cur.executemany(_UPSERT_CACHE_SQL, payload)
@@ -0,0 +1,41 @@
+"""Single background writer — serializes all SQLite writes onto one thread."""
+
+from __future__ import annotations
+
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable
+
+_queue: queue.Queue[tuple[Callable[..., Any], tuple[Any, ...], dict[str, Any], Future]] = queue.Queue()
+_lock = threading.Lock()
+_thread: threading.Thread | None = None
+
+
+def _worker() -> None:
+    while True:
+        fn, args, kwargs, future = _queue.get()
+        if not future.set_running_or_notify_cancel():
+            continue
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as exc:
+            future.set_exception(exc)
+
+
+def _ensure_started() -> None:
+    global _thread
+    if _thread is not None and _thread.is_alive():
+        return
+    with _lock:
+        if _thread is None or not _thread.is_alive():
+            _thread = threading.Thread(target=_worker, name="db-writer", daemon=True)
+            _thread.start()
+
+
+def submit_write(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+    """Queue a db write function for the writer thread; call .result() to wait for it."""
+    _ensure_started()
+    future: Future = Future()
+    _queue.put((fn, args, kwargs, future))
+    return future
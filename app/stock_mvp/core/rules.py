@@ -1,72 +1,94 @@
 from __future__ import annotations
 
+import copy
 from typing import Any
 
 import yaml
 
 from .settings import RULES_PATH
 
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _SafeLoader
+
+# (mtime_ns, parsed rules) of the last successful load; cleared on save.
+_rules_cache: tuple[int, dict[str, Any]] | None = None
+
 
 class RuleValidationError(ValueError):
     pass
 
 
-def _required_keys() -> dict[str, list[str]]:
-    return {
-        "root": [
-            "data_provider",
-            "universe",
-            "filters",
-            "weights",
-            "event_weights",
-            "schedules",
-            "ui",
-        ],
-        "weights": ["profit_trend", "valuation", "future_events", "quality", "risk"],
-        "schedules": ["full_scan_cron", "event_scan_cron", "timezone"],
-    }
+_REQUIRED: dict[str, tuple[str, ...]] = {
+    "root": (
+        "data_provider",
+        "universe",
+        "filters",
+        "weights",
+        "event_weights",
+        "schedules",
+        "ui",
+    ),
+    "weights": ("profit_trend", "valuation", "future_events", "quality", "risk"),
+    "schedules": ("full_scan_cron", "event_scan_cron", "timezone"),
+}
 
+_POSITIVE_WEIGHTS = ("profit_trend", "valuation", "future_events", "quality")
 
-def validate_rules(rules: dict[str, Any]) -> None:
-    required = _required_keys()
 
-    for key in required["root"]:
+def validate_rules(rules: dict[str, Any]) -> None:
+    for key in _REQUIRED["root"]:
         if key not in rules:
             raise RuleValidationError(f"Missing root key: {key}")
 
-    for key in required["weights"]:
-        if key not in rules["weights"]:
+    weights = rules["weights"]
+    for key in _REQUIRED["weights"]:
+        if key not in weights:
             raise RuleValidationError(f"Missing weights.{key}")
 
-    for key in required["schedules"]:
-        if key not in rules["schedules"]:
+    schedules = rules["schedules"]
+    for key in _REQUIRED["schedules"]:
+        if key not in schedules:
             raise RuleValidationError(f"Missing schedules.{key}")
 
-    weight_sum = (
-        float(rules["weights"]["profit_trend"])
-        + float(rules["weights"]["valuation"])
-        + float(rules["weights"]["future_events"])
-        + float(rules["weights"]["quality"])
-    )
+    weight_sum = sum(float(weights[k]) for k in _POSITIVE_WEIGHTS)
     if weight_sum <= 0:
         raise RuleValidationError("Sum of positive weights must be > 0")
 
-    if float(rules["weights"]["risk"]) < 0:
+    if float(weights["risk"]) < 0:
         raise RuleValidationError("weights.risk must be >= 0")
 
 
 def load_rules() -> dict[str, Any]:
-    if not RULES_PATH.exists():
-        raise RuleValidationError(f"Rules file not found: {RULES_PATH}")
+    """Load and validate rules, reusing the parsed copy while the file is unchanged.
+
+    Callers get their own deep copy, so mutating the result never touches the cache.
+    """
+    global _rules_cache
+    try:
+        mtime_ns = RULES_PATH.stat().st_mtime_ns
+    except FileNotFoundError:
+        raise RuleValidationError(f"Rules file not found: {RULES_PATH}") from None
+
+    cached = _rules_cache
+    if cached is not None and cached[0] == mtime_ns:
+        return copy.deepcopy(cached[1])
 
     with RULES_PATH.open("r", encoding="utf-8") as f:
-        data = yaml.safe_load(f)
+        data = yaml.load(f, Loader=_SafeLoader)
 
     if not isinstance(data, dict):
         raise RuleValidationError("Rules YAML must parse into a dictionary")
 
     validate_rules(data)
-    return data
+    _rules_cache = (mtime_ns, data)
+    return copy.deepcopy(data)
+
+
+def rules_etag() -> str:
+    """Weak ETag for the rules file, derived from its modification time."""
+    return f'W/"{RULES_PATH.stat().st_mtime_ns}"'
 
 
 def load_rules_raw() -> str:
@@ -74,10 +96,12 @@ def load_rules_raw() -> str:
 
 
 def save_rules_raw(yaml_text: str) -> dict[str, Any]:
-    parsed = yaml.safe_load(yaml_text)
+    global _rules_cache
+    parsed = yaml.load(yaml_text, Loader=_SafeLoader)
     if not isinstance(parsed, dict):
         raise RuleValidationError("Rules YAML must parse into a dictionary")
 
     validate_rules(parsed)
     RULES_PATH.write_text(yaml_text, encoding="utf-8")
+    _rules_cache = None
     return parsed
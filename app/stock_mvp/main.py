@@ -7,18 +7,23 @@ from urllib.parse import quote as url_quote
 
 import yaml
 from fastapi import FastAPI, Form, HTTPException, Request
-from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
+from fastapi.responses import HTMLResponse, JSONResponse, ORJSONResponse, RedirectResponse, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from dotenv import load_dotenv
 
 from app.stock_mvp.core import db
-from app.stock_mvp.core.rules import RuleValidationError, load_rules, load_rules_raw, save_rules_raw
+from app.stock_mvp.core.rules import RuleValidationError, load_rules, load_rules_raw, rules_etag, save_rules_raw
 from app.stock_mvp.core.settings import STATIC_DIR, TEMPLATE_DIR
 from app.stock_mvp.services.pipeline import PipelineService
 from app.stock_mvp.services import scan_status
 from app.stock_mvp.services.scheduler import reload_scheduler, start_scheduler, stop_scheduler
 
+try:
+    from yaml import CSafeDumper as _SafeDumper
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeDumper as _SafeDumper
+
 load_dotenv()
 logger = logging.getLogger(__name__)
 
@@ -99,13 +104,17 @@ def list_runs_page(request: Request):
 
 @app.get("/runs/{run_id}", response_class=HTMLResponse)
 def run_detail_page(request: Request, run_id: int):
-    run = db.get_run(run_id)
-    if not run:
+    payload = db.get_run_with_recs(run_id)
+    if not payload:
         raise HTTPException(status_code=404, detail="Run not found")
-    recs = db.get_recommendations(run_id)
     return templates.TemplateResponse(
         "run_detail.html",
-        {"request": request, "run": run, "recommendations": recs, "active_page": "runs"},
+        {
+            "request": request,
+            "run": payload["run"],
+            "recommendations": payload["recommendations"],
+            "active_page": "runs",
+        },
     )
 
 
@@ -129,9 +138,8 @@ def rules_page(request: Request):
 @app.post("/rules")
 def save_rules_page(request: Request, yaml_text: str = Form(...)):
     try:
-        save_rules_raw(yaml_text)
+        rules = save_rules_raw(yaml_text)
         reload_scheduler(pipeline)
-        rules = load_rules()
         return templates.TemplateResponse(
             "rules.html",
             {
@@ -144,6 +152,7 @@ def save_rules_page(request: Request, yaml_text: str = Form(...)):
             },
         )
     except RuleValidationError as exc:
+        # The file on disk is unchanged, so this is served from the rules cache
         rules = load_rules()
         return templates.TemplateResponse(
             "rules.html",
@@ -212,7 +221,9 @@ async def save_rules_visual(request: Request):
 
     # Save
     try:
-        yaml_text = yaml.dump(rules, default_flow_style=False, sort_keys=False, allow_unicode=True)
+        yaml_text = yaml.dump(
+            rules, Dumper=_SafeDumper, default_flow_style=False, sort_keys=False, allow_unicode=True
+        )
         save_rules_raw(yaml_text)
         reload_scheduler(pipeline)
         return templates.TemplateResponse(
@@ -243,8 +254,8 @@ async def save_rules_visual(request: Request):
 
 
 @app.get("/api/recommendations/latest")
-def api_recommendations_latest() -> JSONResponse:
-    return JSONResponse(content=_latest_payload())
+def api_recommendations_latest() -> ORJSONResponse:
+    return ORJSONResponse(content=_latest_payload())
 
 
 @app.post("/api/runs/trigger")
@@ -257,16 +268,19 @@ def api_trigger_run() -> JSONResponse:
 
 
 @app.get("/api/runs/{run_id}")
-def api_run_detail(run_id: int) -> JSONResponse:
-    run = db.get_run(run_id)
-    if not run:
+def api_run_detail(run_id: int) -> ORJSONResponse:
+    payload = db.get_run_with_recs(run_id)
+    if not payload:
         raise HTTPException(status_code=404, detail="Run not found")
-    return JSONResponse(content={"run": run, "recommendations": db.get_recommendations(run_id)})
+    return ORJSONResponse(content=payload)
 
 
 @app.get("/api/rules")
-def api_rules_get() -> JSONResponse:
-    return JSONResponse(content=load_rules())
+def api_rules_get(request: Request) -> Response:
+    etag = rules_etag()
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return JSONResponse(content=load_rules(), headers={"ETag": etag})
 
 
 @app.post("/api/rules")
@@ -1,11 +1,12 @@
 from __future__ import annotations
 
+from dataclasses import dataclass, field
 from datetime import date
+from typing import ClassVar
 
-from pydantic import BaseModel
 
-
-class StockSnapshot(BaseModel):
+@dataclass(slots=True, frozen=True)
+class StockSnapshot:
     symbol: str
     name: str
     exchange: str
@@ -23,10 +24,11 @@ class StockSnapshot(BaseModel):
     hni_net_buying_cr: float
     esm_flag: bool
     governance_flag: bool
-    metrics: dict[str, float] = {}
+    metrics: dict[str, float] = field(default_factory=dict)
 
 
-class StockEvent(BaseModel):
+@dataclass(slots=True, frozen=True)
+class StockEvent:
     symbol: str
     event_type: str
     event_date: date
@@ -34,7 +36,17 @@ class StockEvent(BaseModel):
     headline: str
 
 
-class ScoredStock(BaseModel):
+@dataclass(slots=True, frozen=True)
+class ScoredStock:
+    # Order of the values in score_breakdown
+    BREAKDOWN_KEYS: ClassVar[tuple[str, ...]] = (
+        "profit_trend",
+        "valuation",
+        "future_events",
+        "quality",
+        "risk_penalty",
+    )
+
     symbol: str
     name: str
     exchange: str
@@ -42,7 +54,12 @@ class ScoredStock(BaseModel):
     market_cap_cr: float
     pe: float
     final_score: float
-    score_breakdown: dict[str, float]
-    reasons: list[str]
+    score_breakdown: tuple[float, float, float, float, float]
+    reasons: tuple[str, ...]
     event_count: int
-    metrics: dict[str, float] = {}
+    metrics: dict[str, float] = field(default_factory=dict)
+
+    @property
+    def breakdown(self) -> dict[str, float]:
+        """score_breakdown keyed by BREAKDOWN_KEYS."""
+        return dict(zip(self.BREAKDOWN_KEYS, self.score_breakdown))
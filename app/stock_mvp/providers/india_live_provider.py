@@ -3,14 +3,21 @@ from __future__ import annotations
 import csv
 import logging
 import re
-from datetime import date, datetime, timedelta
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
 import requests
+from requests.adapters import HTTPAdapter
 import yfinance as yf
 
 from app.stock_mvp.core import db
+from app.stock_mvp.core.db_writer import submit_write
 from app.stock_mvp.core.settings import BASE_DIR
 from app.stock_mvp.models.schemas import StockEvent, StockSnapshot
 from app.stock_mvp.providers.base import DataProvider
@@ -18,13 +25,127 @@ from app.stock_mvp.services import scan_status
 
 logger = logging.getLogger(__name__)
 
+_WS_RE = re.compile(r"\s+")
+_CR_RE = re.compile(r"(\d+(?:\.\d+)?)\s*(?:crore|cr)\b")
+_LAKH_RE = re.compile(r"(\d+(?:\.\d+)?)\s*(?:lakh|lac)\b")
+
+# (event_type, needles) in priority order: the first rule with any needle in the text wins.
+_EVENT_RULES: tuple[tuple[str, tuple[str, ...]], ...] = (
+    ("preferential_allotment", ("preferential", "allotment", "warrant")),
+    ("capacity_expansion", ("capacity expansion", "expand capacity", "commissioned")),
+    ("new_plant", ("new plant", "plant commissioned", "factory commenced")),
+    ("acquisition", ("acquisition", "acquire", "takeover")),
+    ("partnership", ("partnership", "mou", "joint venture", "collaborat")),
+    ("subsidiary_launch", ("subsidiary", "incorporated", "wholly owned")),
+    ("large_order", ("order", "order book", "contract awarded", "work order")),
+)
+# Flattened (needle, event_type) table in the same priority order, scanned in one loop
+_EVENT_NEEDLES: tuple[tuple[str, str], ...] = tuple(
+    (needle, event_type) for event_type, needles in _EVENT_RULES for needle in needles
+)
+
+# Non-ISO layouts seen in NSE payloads; ISO dates are handled by fromisoformat first.
+_DATE_FMTS = (
+    "%d-%m-%Y",
+    "%d/%m/%Y",
+    "%d-%b-%Y",
+    "%d-%b-%Y %H:%M:%S",
+)
+_MONTHS = {
+    "JAN": 1, "FEB": 2, "MAR": 3, "APR": 4, "MAY": 5, "JUN": 6,
+    "JUL": 7, "AUG": 8, "SEP": 9, "OCT": 10, "NOV": 11, "DEC": 12,
+}
+
+
+def _parse_nse_date(raw: str) -> date | None:
+    """Fast path for NSE's usual "15-Oct-2024" / "15-Oct-2024 18:30:00" dates."""
+    if len(raw) < 11 or raw[2] != "-" or raw[6] != "-" or (len(raw) > 11 and raw[11] != " "):
+        return None
+    month = _MONTHS.get(raw[3:6].upper())
+    day, year = raw[:2], raw[7:11]
+    if month is None or not day.isdigit() or not year.isdigit():
+        return None
+    try:
+        return date(int(year), month, int(day))
+    except ValueError:
+        return None
+
+
+def _fnum(d: dict[str, Any], *keys: str) -> float:
+    """First truthy value among keys as a float, else 0.0 (mirrors `float(a or b or 0.0)`)."""
+    for key in keys:
+        v = d.get(key)
+        if v:
+            return float(v)
+    return 0.0
+
+
+@lru_cache(maxsize=2048)
+def _to_yahoo_symbol(symbol: str) -> str:
+    return symbol if symbol.endswith((".NS", ".BO")) else f"{symbol}.NS"
+
+
+@lru_cache(maxsize=8)
+def _resolve_symbols_file(symbols_file: str) -> Path:
+    path = Path(symbols_file)
+    if not path.is_absolute():
+        path = (BASE_DIR / path).resolve()
+    return path
+
+
+# Process-local LRU of fundamentals keyed by symbol -> (expires_at, entry), in front of stock_cache
+_FUND_CACHE_MAX_ENTRIES = 5000
+_FUND_CACHE: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+_FUND_CACHE_LOCK = threading.Lock()
+
+_DOWNLOAD_LOCK = threading.Lock()
+
+
+def _fund_cache_get_many(symbols: list[str]) -> dict[str, dict[str, Any]]:
+    now = time.time()
+    hits: dict[str, dict[str, Any]] = {}
+    with _FUND_CACHE_LOCK:
+        for symbol in symbols:
+            item = _FUND_CACHE.get(symbol)
+            if item is None:
+                continue
+            if item[0] <= now:
+                del _FUND_CACHE[symbol]
+                continue
+            _FUND_CACHE.move_to_end(symbol)
+            hits[symbol] = item[1]
+    return hits
+
+
+def _fund_cache_put_many(entries: list[tuple[str, float, dict[str, Any]]]) -> None:
+    """Store (symbol, expires_at, entry) triples, evicting least recently used past the cap."""
+    with _FUND_CACHE_LOCK:
+        for symbol, expires_at, entry in entries:
+            _FUND_CACHE[symbol] = (expires_at, entry)
+            _FUND_CACHE.move_to_end(symbol)
+        while len(_FUND_CACHE) > _FUND_CACHE_MAX_ENTRIES:
+            _FUND_CACHE.popitem(last=False)
+
+
+def _fetched_at_epoch(raw: Any) -> float | None:
+    """Epoch seconds for a stored fetched_at string; None when it can't be parsed."""
+    try:
+        fetched_at = datetime.fromisoformat(raw)
+    except (ValueError, TypeError):
+        return None
+    if fetched_at.tzinfo is None:
+        fetched_at = fetched_at.replace(tzinfo=timezone.utc)
+    return fetched_at.timestamp()
+
 
 class NSEAnnouncementsClient:
     BASE_WEB = "https://www.nseindia.com"
     API_ANNOUNCEMENTS = "https://www.nseindia.com/api/corporate-announcements"
+    BOOTSTRAP_TTL_SEC = 15 * 60
 
     def __init__(self, timeout_sec: int = 12):
         self.timeout_sec = timeout_sec
+        self._bootstrapped_at: float | None = None
         self.session = requests.Session()
         self.session.headers.update(
             {
@@ -38,26 +159,71 @@ class NSEAnnouncementsClient:
             }
         )
 
-    def _bootstrap(self) -> None:
+    def _bootstrap(self, force: bool = False) -> None:
+        # NSE's landing-page cookies expire, so they are refreshed after BOOTSTRAP_TTL_SEC
+        # (or on demand after a rejected API call) rather than fetched once per session
+        now = time.monotonic()
+        fresh = self._bootstrapped_at is not None and now - self._bootstrapped_at < self.BOOTSTRAP_TTL_SEC
+        if fresh and not force:
+            return
+        self._bootstrapped_at = None
         try:
             self.session.get(self.BASE_WEB, timeout=self.timeout_sec)
         except requests.RequestException:
             return
+        self._bootstrapped_at = now
 
-    def fetch_events(self, symbol: str, lookback_days: int = 90) -> list[StockEvent]:
+    def _get_announcements(self, params: dict[str, str]) -> list[Any] | None:
         self._bootstrap()
-        params = {"index": "equities", "symbol": symbol}
-
+        payload = self._request_announcements(params)
+        if payload is None:
+            # Likely stale cookies (401/403): re-bootstrap and retry once
+            self._bootstrap(force=True)
+            payload = self._request_announcements(params)
+        return payload
+
+    def _request_announcements(self, params: dict[str, str]) -> list[Any] | None:
         try:
             resp = self.session.get(self.API_ANNOUNCEMENTS, params=params, timeout=self.timeout_sec)
             resp.raise_for_status()
             payload = resp.json()
         except (requests.RequestException, ValueError):
-            return []
+            return None
 
         if not isinstance(payload, list):
+            return None
+        return payload
+
+    def fetch_events(self, symbol: str, lookback_days: int = 90) -> list[StockEvent]:
+        payload = self._get_announcements({"index": "equities", "symbol": symbol})
+        if payload is None:
             return []
+        return self._parse_events(payload, lookback_days, symbol=symbol)
+
+    def fetch_events_bulk(self, symbols: set[str], lookback_days: int = 90) -> list[StockEvent] | None:
+        """Fetch announcements for every symbol with one date-range request.
+
+        Returns None when the request fails so callers can fall back to per-symbol fetches.
+        """
+        today = date.today()
+        payload = self._get_announcements(
+            {
+                "index": "equities",
+                "from_date": (today - timedelta(days=lookback_days)).strftime("%d-%m-%Y"),
+                "to_date": today.strftime("%d-%m-%Y"),
+            }
+        )
+        if payload is None:
+            return None
+        return self._parse_events(payload, lookback_days, symbols=symbols)
 
+    def _parse_events(
+        self,
+        payload: list[Any],
+        lookback_days: int,
+        symbol: str | None = None,
+        symbols: set[str] | None = None,
+    ) -> list[StockEvent]:
         cutoff = date.today() - timedelta(days=lookback_days)
         out: list[StockEvent] = []
 
@@ -65,6 +231,12 @@ class NSEAnnouncementsClient:
             if not isinstance(item, dict):
                 continue
 
+            item_symbol = symbol
+            if symbols is not None:
+                item_symbol = str(item.get("symbol") or "").strip().upper()
+                if item_symbol not in symbols:
+                    continue
+
             text = self._pick_text(item)
             if not text:
                 continue
@@ -79,7 +251,7 @@ class NSEAnnouncementsClient:
 
             out.append(
                 StockEvent(
-                    symbol=symbol,
+                    symbol=item_symbol,
                     event_type=event_type,
                     event_date=d,
                     value_cr=self._extract_value_cr(text),
@@ -94,7 +266,7 @@ class NSEAnnouncementsClient:
         for key in ("desc", "subject", "sm_name", "headline", "attchmntText"):
             v = item.get(key)
             if isinstance(v, str) and v.strip():
-                return re.sub(r"\s+", " ", v.strip())
+                return _WS_RE.sub(" ", v.strip())
         return ""
 
     @staticmethod
@@ -110,49 +282,36 @@ class NSEAnnouncementsClient:
                     continue
             if isinstance(raw, str):
                 raw = raw.strip()
-                for fmt in (
-                    "%Y-%m-%d",
-                    "%d-%m-%Y",
-                    "%d/%m/%Y",
-                    "%d-%b-%Y",
-                    "%d-%b-%Y %H:%M:%S",
-                    "%Y-%m-%d %H:%M:%S",
-                ):
+                try:
+                    return datetime.fromisoformat(raw.replace("Z", "+00:00")).date()
+                except ValueError:
+                    pass
+                d = _parse_nse_date(raw)
+                if d is not None:
+                    return d
+                for fmt in _DATE_FMTS:
                     try:
                         return datetime.strptime(raw, fmt).date()
                     except ValueError:
                         continue
-                try:
-                    return datetime.fromisoformat(raw.replace("Z", "+00:00")).date()
-                except ValueError:
-                    continue
         return date.today()
 
     @staticmethod
     def _classify_event_type(text: str) -> str | None:
         t = text.lower()
-        rules = [
-            ("preferential_allotment", ["preferential", "allotment", "warrant"]),
-            ("capacity_expansion", ["capacity expansion", "expand capacity", "commissioned"]),
-            ("new_plant", ["new plant", "plant commissioned", "factory commenced"]),
-            ("acquisition", ["acquisition", "acquire", "takeover"]),
-            ("partnership", ["partnership", "mou", "joint venture", "collaborat"]),
-            ("subsidiary_launch", ["subsidiary", "incorporated", "wholly owned"]),
-            ("large_order", ["order", "order book", "contract awarded", "work order"]),
-        ]
-        for event_type, needles in rules:
-            if any(k in t for k in needles):
+        for needle, event_type in _EVENT_NEEDLES:
+            if needle in t:
                 return event_type
         return None
 
     @staticmethod
     def _extract_value_cr(text: str) -> float:
         t = text.lower().replace(",", "")
-        m_cr = re.search(r"(\d+(?:\.\d+)?)\s*(?:crore|cr)\b", t)
+        m_cr = _CR_RE.search(t)
         if m_cr:
             return float(m_cr.group(1))
 
-        m_lakh = re.search(r"(\d+(?:\.\d+)?)\s*(?:lakh|lac)\b", t)
+        m_lakh = _LAKH_RE.search(t)
         if m_lakh:
             return float(m_lakh.group(1)) / 100.0
 
@@ -168,6 +327,12 @@ class IndiaLiveProvider(DataProvider):
     """
 
     CACHE_MAX_AGE_DAYS = 90
+    # Fundamentals fetches are network-bound, so overlap the Yahoo round-trips
+    FETCH_WORKERS = 16
+    FLUSH_EVERY = 100
+    STATUS_EVERY = 5
+    # Concurrent per-ticker downloads inside yf.download (default is 2x CPU count)
+    PRICE_FETCH_WORKERS = 16
 
     def __init__(
         self,
@@ -176,14 +341,17 @@ class IndiaLiveProvider(DataProvider):
         timeout_sec: int = 12,
         nse_events_enabled: bool = True,
     ) -> None:
-        self.symbols_file = Path(symbols_file)
-        if not self.symbols_file.is_absolute():
-            self.symbols_file = (BASE_DIR / self.symbols_file).resolve()
+        self.symbols_file = _resolve_symbols_file(symbols_file)
         self.max_symbols = max_symbols
         self.timeout_sec = timeout_sec
         self.nse_events_enabled = nse_events_enabled
         self.nse_client = NSEAnnouncementsClient(timeout_sec=timeout_sec)
 
+        # One keep-alive session for every Yahoo call, sized for the fetch pool
+        self._yf_session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32)
+        self._yf_session.mount("https://", adapter)
+
     def get_stock_snapshots(self) -> list[StockSnapshot]:
         symbols = self._load_symbols()
         if not symbols:
@@ -192,13 +360,27 @@ class IndiaLiveProvider(DataProvider):
         scan_status.start_scan(len(symbols))
 
         # Phase 1: Check cache — identify which symbols need full fetch
-        cached = db.get_cached_fundamentals(symbols, max_age_days=self.CACHE_MAX_AGE_DAYS)
-        cached_symbols = set(cached.keys())
-        stale_symbols = [s for s in symbols if s not in cached_symbols]
+        cache_ttl_sec = self.CACHE_MAX_AGE_DAYS * 86400
+        cached = _fund_cache_get_many(symbols)
+        misses = [s for s in symbols if s not in cached]
+        if misses:
+            # Rows loaded from SQLite keep their original age: they expire max-age after fetched_at.
+            # A fetched_at that doesn't parse counts as expired, so the symbol is refetched.
+            from_db: list[tuple[str, float, dict[str, Any]]] = []
+            for symbol, (entry, fetched_at) in db.get_cached_fundamentals(
+                misses, max_age_days=self.CACHE_MAX_AGE_DAYS
+            ).items():
+                fetched_epoch = _fetched_at_epoch(fetched_at)
+                if fetched_epoch is None:
+                    continue
+                from_db.append((symbol, fetched_epoch + cache_ttl_sec, entry))
+                cached[symbol] = entry
+            _fund_cache_put_many(from_db)
+        stale_symbols = [s for s in symbols if s not in cached]
 
         logger.info(
             "Cache status: %d cached, %d stale/missing (of %d total)",
-            len(cached_symbols),
+            len(cached),
             len(stale_symbols),
             len(symbols),
         )
@@ -209,24 +391,43 @@ class IndiaLiveProvider(DataProvider):
                 message=f"Fetching fundamentals for {len(stale_symbols)} new stocks...",
             )
 
-        # Phase 2: Full fetch for stale/missing symbols (slow, per-symbol)
+        # Phase 2: Full fetch for stale/missing symbols (slow, per-symbol, run concurrently)
         new_cache_entries: list[dict[str, Any]] = []
-        for i, symbol in enumerate(stale_symbols, 1):
-            scan_status.update_scan(
-                "fetching_fundamentals", i, symbol=symbol,
-                message=f"Fetching {symbol} ({i}/{len(stale_symbols)})",
-            )
-            entry = self._fetch_fundamentals(symbol)
-            if entry is not None:
-                cached[symbol] = entry
-                new_cache_entries.append(entry)
-            # Persist in batches of 20 to avoid losing progress on crash
-            if len(new_cache_entries) % 20 == 0 and new_cache_entries:
-                db.upsert_fundamentals_cache(new_cache_entries[-20:])
-
-        # Phase 3: Persist remaining newly fetched fundamentals to cache
+        flushed_idx = 0
+        n_stale = len(stale_symbols)
+        progress_suffix = f"/{n_stale})"
+        with ThreadPoolExecutor(max_workers=self.FETCH_WORKERS) as pool:
+            futures = {pool.submit(self._fetch_fundamentals, s): s for s in stale_symbols}
+            try:
+                for i, future in enumerate(as_completed(futures), 1):
+                    symbol = futures[future]
+                    # Progress is throttled to every STATUS_EVERY symbols (and the last one)
+                    if i % self.STATUS_EVERY == 0 or i == n_stale:
+                        scan_status.update_scan(
+                            "fetching_fundamentals", i, symbol=symbol,
+                            message="Fetched " + symbol + " (" + str(i) + progress_suffix,
+                            force=i == n_stale,
+                        )
+                    entry = future.result()
+                    if entry is None:
+                        continue
+                    cached[symbol] = entry
+                    new_cache_entries.append(entry)
+                    # Persist every FLUSH_EVERY entries so a crash loses at most one batch
+                    if len(new_cache_entries) - flushed_idx >= self.FLUSH_EVERY:
+                        submit_write(db.upsert_fundamentals_cache, new_cache_entries[flushed_idx:]).result()
+                        flushed_idx = len(new_cache_entries)
+            except BaseException:
+                # Drop queued fetches so the pool exit doesn't wait on them
+                pool.shutdown(wait=False, cancel_futures=True)
+                raise
+
+        # Phase 3: Persist the not-yet-flushed tail in one transaction
         if new_cache_entries:
-            db.upsert_fundamentals_cache(new_cache_entries)
+            if flushed_idx < len(new_cache_entries):
+                submit_write(db.upsert_fundamentals_cache, new_cache_entries[flushed_idx:]).result()
+            expires_at = time.time() + cache_ttl_sec
+            _fund_cache_put_many([(e["symbol"], expires_at, e) for e in new_cache_entries])
             logger.info("Cached %d new/updated fundamentals", len(new_cache_entries))
 
         # Phase 4: Batch fetch live prices (single API call)
@@ -236,20 +437,23 @@ class IndiaLiveProvider(DataProvider):
         )
         live_prices = self._batch_fetch_prices(symbols)
 
-        # Phase 5: Merge cached fundamentals + live prices → StockSnapshots
+        # Phase 5: Merge cached fundamentals + live prices → StockSnapshots.
+        # Cache entries are shared with the in-memory cache, so only a live price gets a fresh
+        # metrics dict; unpriced symbols reuse the cached one.
+        snap_cls = StockSnapshot
         out: list[StockSnapshot] = []
         for symbol in symbols:
             fund = cached.get(symbol)
             if fund is None:
                 continue
 
-            # Update current_price with live data if available
-            metrics = dict(fund.get("metrics", {}))
-            if symbol in live_prices:
-                metrics["current_price"] = live_prices[symbol]
+            metrics = fund.get("metrics") or {}
+            price = live_prices.get(symbol)
+            if price is not None:
+                metrics = {**metrics, "current_price": price}
 
             out.append(
-                StockSnapshot(
+                snap_cls(
                     symbol=fund["symbol"],
                     name=fund["name"],
                     exchange=fund["exchange"],
@@ -278,6 +482,10 @@ class IndiaLiveProvider(DataProvider):
             return []
 
         symbols = self._load_symbols()
+        bulk = self.nse_client.fetch_events_bulk(set(symbols), lookback_days=lookback_days)
+        if bulk is not None:
+            return bulk
+
         out: list[StockEvent] = []
         for symbol in symbols:
             out.extend(self.nse_client.fetch_events(symbol=symbol, lookback_days=lookback_days))
@@ -297,15 +505,15 @@ class IndiaLiveProvider(DataProvider):
 
     def _fetch_fundamentals(self, symbol: str) -> dict[str, Any] | None:
         """Full per-symbol fetch via yf.Ticker().info — slow but comprehensive."""
-        yahoo_symbol = self._to_yahoo_symbol(symbol)
+        yahoo_symbol = _to_yahoo_symbol(symbol)
 
         try:
-            ticker = yf.Ticker(yahoo_symbol)
+            ticker = yf.Ticker(yahoo_symbol, session=self._yf_session)
             info = ticker.info or {}
         except Exception:
             return None
 
-        market_cap = float(info.get("marketCap") or 0.0)
+        market_cap = _fnum(info, "marketCap")
         if market_cap <= 0:
             try:
                 fi = ticker.fast_info
@@ -313,11 +521,13 @@ class IndiaLiveProvider(DataProvider):
             except Exception:
                 market_cap = 0.0
 
-        pe = float(info.get("trailingPE") or info.get("forwardPE") or 0.0)
+        pe = _fnum(info, "trailingPE", "forwardPE")
 
-        q_values = self._extract_quarterly_net_income(ticker)
+        # One quarterly_income_stmt fetch feeds both the current and the previous TTM window
+        q_all = self._extract_quarterly_net_income(ticker)
+        q_values = q_all[-4:]
         if len(q_values) < 4:
-            net_income = float(info.get("netIncomeToCommon") or 0.0)
+            net_income = _fnum(info, "netIncomeToCommon")
             if net_income <= 0:
                 return None
             q_values = [net_income / 4.0] * 4
@@ -325,7 +535,7 @@ class IndiaLiveProvider(DataProvider):
         q1, q2, q3, q4 = q_values[-4:]
         profit_ttm = sum([q1, q2, q3, q4])
 
-        prev = self._extract_previous_four_quarters(ticker)
+        prev = q_all[-8:-4] if len(q_all) >= 8 else []
         if len(prev) == 4:
             profit_prev_ttm = sum(prev)
         else:
@@ -335,26 +545,26 @@ class IndiaLiveProvider(DataProvider):
         name = str(info.get("longName") or info.get("shortName") or symbol)
         sector = str(info.get("sector") or "Unknown")
 
-        promoter_holding_pct = float(info.get("heldPercentInsiders") or 0.0) * 100.0
+        promoter_holding_pct = _fnum(info, "heldPercentInsiders") * 100.0
         pledge_pct = 0.0
         hni_net_buying_cr = 0.0
 
         inr_to_cr = 1e7
 
-        current_price = float(info.get("currentPrice") or info.get("regularMarketPrice") or 0.0)
-        book_value = float(info.get("bookValue") or 0.0)
-        price_to_book = float(info.get("priceToBook") or 0.0)
-        dividend_yield = float(info.get("dividendYield") or 0.0) * 100.0
-        roe = float(info.get("returnOnEquity") or 0.0) * 100.0
-        total_revenue = float(info.get("totalRevenue") or 0.0)
-        total_debt = float(info.get("totalDebt") or 0.0)
-        operating_income = float(info.get("operatingIncome") or info.get("ebitda") or 0.0)
-        total_equity = float(info.get("totalStockholderEquity") or 0.0)
-        high_52w = float(info.get("fiftyTwoWeekHigh") or 0.0)
-        low_52w = float(info.get("fiftyTwoWeekLow") or 0.0)
+        current_price = _fnum(info, "currentPrice", "regularMarketPrice")
+        book_value = _fnum(info, "bookValue")
+        price_to_book = _fnum(info, "priceToBook")
+        dividend_yield = _fnum(info, "dividendYield") * 100.0
+        roe = _fnum(info, "returnOnEquity") * 100.0
+        total_revenue = _fnum(info, "totalRevenue")
+        total_debt = _fnum(info, "totalDebt")
+        operating_income = _fnum(info, "operatingIncome", "ebitda")
+        total_equity = _fnum(info, "totalStockholderEquity")
+        high_52w = _fnum(info, "fiftyTwoWeekHigh")
+        low_52w = _fnum(info, "fiftyTwoWeekLow")
 
         capital_employed = total_equity + total_debt
-        ebit = float(info.get("ebit") or operating_income or 0.0)
+        ebit = _fnum(info, "ebit") or operating_income
         roce = (ebit / capital_employed * 100.0) if capital_employed > 0 else 0.0
 
         metrics = {
@@ -394,16 +604,20 @@ class IndiaLiveProvider(DataProvider):
 
     def _batch_fetch_prices(self, symbols: list[str]) -> dict[str, float]:
         """Batch fetch live prices for all symbols in a single yf.download() call."""
-        yahoo_symbols = [self._to_yahoo_symbol(s) for s in symbols]
-        nse_to_original = {self._to_yahoo_symbol(s): s for s in symbols}
+        original_of = dict(zip(map(_to_yahoo_symbol, symbols), symbols))
+        yahoo_symbols = list(original_of)
 
         try:
-            df = yf.download(
-                yahoo_symbols,
-                period="1d",
-                progress=False,
-                threads=True,
-            )
+            # yf.download fans out per ticker on its own thread pool but keeps results in
+            # module globals, so calls (scan vs. price refresh) must not overlap.
+            with _DOWNLOAD_LOCK:
+                df = yf.download(
+                    yahoo_symbols,
+                    period="1d",
+                    progress=False,
+                    threads=min(self.PRICE_FETCH_WORKERS, len(yahoo_symbols)),
+                    session=self._yf_session,
+                )
         except Exception as exc:
             logger.warning("Batch price fetch failed: %s", exc)
             return {}
@@ -416,39 +630,29 @@ class IndiaLiveProvider(DataProvider):
         # yf.download returns different column structures for single vs multiple symbols
         if len(yahoo_symbols) == 1:
             # Single symbol: columns are just ["Open", "High", "Low", "Close", ...]
-            ys = yahoo_symbols[0]
-            original = nse_to_original.get(ys, ys.replace(".NS", "").replace(".BO", ""))
             try:
                 close_val = df["Close"].iloc[-1]
                 if close_val and float(close_val) > 0:
-                    prices[original] = round(float(close_val), 2)
+                    prices[original_of[yahoo_symbols[0]]] = round(float(close_val), 2)
             except (KeyError, IndexError, TypeError, ValueError):
                 pass
         else:
             # Multiple symbols: MultiIndex columns like ("Close", "RELIANCE.NS")
             try:
-                close_df = df["Close"]
-            except KeyError:
+                last = df["Close"].iloc[-1].dropna()
+            except (KeyError, IndexError):
                 return prices
 
-            for ys in yahoo_symbols:
-                original = nse_to_original.get(ys, ys.replace(".NS", "").replace(".BO", ""))
+            for ys, val in last.items():
                 try:
-                    val = close_df[ys].iloc[-1]
-                    if val and float(val) > 0:
-                        prices[original] = round(float(val), 2)
-                except (KeyError, IndexError, TypeError, ValueError):
+                    if val > 0:
+                        prices[original_of[ys]] = round(float(val), 2)
+                except (KeyError, TypeError, ValueError):
                     continue
 
         logger.info("Batch fetched prices for %d / %d symbols", len(prices), len(symbols))
         return prices
 
-    @staticmethod
-    def _to_yahoo_symbol(symbol: str) -> str:
-        if symbol.endswith(".NS") or symbol.endswith(".BO"):
-            return symbol
-        return f"{symbol}.NS"
-
     @staticmethod
     def _extract_quarterly_net_income(ticker: yf.Ticker) -> list[float]:
         try:
@@ -496,10 +700,3 @@ class IndiaLiveProvider(DataProvider):
 
         values.sort(key=lambda x: x[0])
         return [v for _, v in values]
-
-    @classmethod
-    def _extract_previous_four_quarters(cls, ticker: yf.Ticker) -> list[float]:
-        vals = cls._extract_quarterly_net_income(ticker)
-        if len(vals) < 8:
-            return []
-        return vals[-8:-4]
@@ -3,50 +3,78 @@ from __future__ import annotations
 import csv
 from datetime import date, timedelta
 
+import pandas as pd
+
 from app.stock_mvp.core.settings import SAMPLE_EVENTS_PATH, SAMPLE_STOCKS_PATH
 from app.stock_mvp.models.schemas import StockEvent, StockSnapshot
 from app.stock_mvp.providers.base import DataProvider
 
+_STR_COLUMNS = ("symbol", "name", "exchange", "sector")
+_FLOAT_COLUMNS = (
+    "market_cap_cr",
+    "pe",
+    "profit_ttm_cr",
+    "profit_prev_ttm_cr",
+    "profit_q1_cr",
+    "profit_q2_cr",
+    "profit_q3_cr",
+    "profit_q4_cr",
+    "promoter_holding_pct",
+    "pledge_pct",
+    "hni_net_buying_cr",
+)
+_BOOL_COLUMNS = ("esm_flag", "governance_flag")
+
+
+def _parse_bool(raw: str) -> bool:
+    return raw.strip().lower() == "true"
+
 
 class MockDataProvider(DataProvider):
     def get_stock_snapshots(self) -> list[StockSnapshot]:
-        rows: list[StockSnapshot] = []
-        with SAMPLE_STOCKS_PATH.open("r", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                rows.append(
-                    StockSnapshot(
-                        symbol=row["symbol"].strip(),
-                        name=row["name"].strip(),
-                        exchange=row["exchange"].strip(),
-                        sector=row["sector"].strip(),
-                        market_cap_cr=float(row["market_cap_cr"]),
-                        pe=float(row["pe"]),
-                        profit_ttm_cr=float(row["profit_ttm_cr"]),
-                        profit_prev_ttm_cr=float(row["profit_prev_ttm_cr"]),
-                        profit_q1_cr=float(row["profit_q1_cr"]),
-                        profit_q2_cr=float(row["profit_q2_cr"]),
-                        profit_q3_cr=float(row["profit_q3_cr"]),
-                        profit_q4_cr=float(row["profit_q4_cr"]),
-                        promoter_holding_pct=float(row["promoter_holding_pct"]),
-                        pledge_pct=float(row["pledge_pct"]),
-                        hni_net_buying_cr=float(row["hni_net_buying_cr"]),
-                        esm_flag=row["esm_flag"].strip().lower() == "true",
-                        governance_flag=row["governance_flag"].strip().lower() == "true",
-                    )
-                )
-        return rows
+        df = pd.read_csv(
+            SAMPLE_STOCKS_PATH,
+            dtype=dict.fromkeys(_FLOAT_COLUMNS, "float64"),
+            converters={
+                **dict.fromkeys(_STR_COLUMNS, str.strip),
+                **dict.fromkeys(_BOOL_COLUMNS, _parse_bool),
+            },
+        )
+        return [
+            StockSnapshot(
+                symbol=r.symbol,
+                name=r.name,
+                exchange=r.exchange,
+                sector=r.sector,
+                market_cap_cr=float(r.market_cap_cr),
+                pe=float(r.pe),
+                profit_ttm_cr=float(r.profit_ttm_cr),
+                profit_prev_ttm_cr=float(r.profit_prev_ttm_cr),
+                profit_q1_cr=float(r.profit_q1_cr),
+                profit_q2_cr=float(r.profit_q2_cr),
+                profit_q3_cr=float(r.profit_q3_cr),
+                profit_q4_cr=float(r.profit_q4_cr),
+                promoter_holding_pct=float(r.promoter_holding_pct),
+                pledge_pct=float(r.pledge_pct),
+                hni_net_buying_cr=float(r.hni_net_buying_cr),
+                esm_flag=r.esm_flag,
+                governance_flag=r.governance_flag,
+            )
+            for r in df.itertuples(index=False)
+        ]
 
     def get_recent_events(self, lookback_days: int = 60) -> list[StockEvent]:
-        cutoff = date.today() - timedelta(days=lookback_days)
+        # ISO dates order lexically, so rejects are dropped before paying for a parse
+        cutoff = (date.today() - timedelta(days=lookback_days)).isoformat()
         rows: list[StockEvent] = []
 
         with SAMPLE_EVENTS_PATH.open("r", encoding="utf-8") as f:
             reader = csv.DictReader(f)
             for row in reader:
-                event_date = date.fromisoformat(row["event_date"])
-                if event_date < cutoff:
+                raw_date = row["event_date"]
+                if raw_date < cutoff:
                     continue
+                event_date = date.fromisoformat(raw_date)
                 rows.append(
                     StockEvent(
                         symbol=row["symbol"].strip(),
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+import json
 import logging
 import threading
 from typing import Any
 
 from app.stock_mvp.core import db
+from app.stock_mvp.core.db_writer import submit_write
 from app.stock_mvp.core.rules import load_rules
 from app.stock_mvp.models.schemas import StockSnapshot
 from app.stock_mvp.providers.base import DataProvider
@@ -18,6 +20,21 @@ logger = logging.getLogger(__name__)
 class PipelineService:
     def __init__(self, provider: DataProvider | None = None) -> None:
         self.provider = provider
+        # (data_provider config key, provider) so scans reuse sessions and in-memory caches
+        self._built_provider: tuple[str, DataProvider] | None = None
+        self._provider_lock = threading.Lock()
+
+    def get_provider(self, rules: dict[str, Any]) -> DataProvider:
+        if self.provider is not None:
+            return self.provider
+
+        key = json.dumps(rules.get("data_provider", {}), sort_keys=True, default=str)
+        with self._provider_lock:
+            built = self._built_provider
+            if built is None or built[0] != key:
+                built = (key, build_provider(rules))
+                self._built_provider = built
+        return built[1]
 
     def run_scan_background(self, run_type: str = "manual") -> None:
         """Run scan in a background thread so the UI doesn't block."""
@@ -33,9 +50,9 @@ class PipelineService:
 
     def run_scan(self, run_type: str = "manual") -> dict[str, Any]:
         rules = load_rules()
-        provider = self.provider or build_provider(rules)
+        provider = self.get_provider(rules)
 
-        run_id = db.create_run(run_type=run_type, rules_snapshot=rules)
+        run_id = submit_write(db.create_run, run_type=run_type, rules_snapshot=rules).result()
 
         try:
             lookback_days = int(rules.get("data_provider", {}).get("events_lookback_days", 90))
@@ -50,11 +67,9 @@ class PipelineService:
             universe = self._apply_universe_filters(stocks, rules)
             passed = self._apply_quality_filters(universe, rules)
 
-            scorer = ScoreEngine(rules)
-            scored = scorer.score(passed, events)
-
             max_n = int(rules.get("ui", {}).get("max_recommendations_per_run", 25))
-            top = scored[:max_n]
+            scorer = ScoreEngine(rules)
+            top = scorer.score(passed, events, top_k=max_n)
 
             rec_rows: list[dict[str, Any]] = []
             for idx, s in enumerate(top, start=1):
@@ -68,7 +83,7 @@ class PipelineService:
                         "market_cap_cr": s.market_cap_cr,
                         "pe": s.pe,
                         "final_score": s.final_score,
-                        "score_breakdown": s.score_breakdown,
+                        "score_breakdown": s.breakdown,
                         "reasons": s.reasons,
                         "event_count": s.event_count,
                         "metrics": s.metrics,
@@ -76,7 +91,7 @@ class PipelineService:
                 )
 
             if rec_rows:
-                db.insert_recommendations(run_id, rec_rows)
+                submit_write(db.insert_recommendations, run_id, rec_rows).result()
 
             summary = {
                 "run_id": run_id,
@@ -87,16 +102,13 @@ class PipelineService:
                 "recommended_count": len(rec_rows),
             }
 
-            db.complete_run(run_id, summary)
+            submit_write(db.complete_run, run_id, summary).result()
             scan_status.finish_scan(f"Done — {len(rec_rows)} recommendations from {len(stocks)} stocks")
 
-            return {
-                "run": db.get_run(run_id),
-                "recommendations": db.get_recommendations(run_id),
-            }
+            return db.get_run_with_recs(run_id)
 
         except Exception as exc:
-            db.fail_run(run_id, str(exc))
+            submit_write(db.fail_run, run_id, str(exc)).result()
             scan_status.finish_scan(f"Scan failed: {exc}")
             raise
 
@@ -109,11 +121,13 @@ class PipelineService:
 
         output: list[StockSnapshot] = []
         for s in stocks:
-            if s.market_cap_cr < min_mc or s.market_cap_cr > max_mc:
-                continue
-            if exchanges and s.exchange not in exchanges:
-                continue
-            if sectors_allowlist and s.sector not in sectors_allowlist:
+            # Set-membership checks first: a sector allowlist usually rejects most rows before the float compares
+            if (
+                (sectors_allowlist and s.sector not in sectors_allowlist)
+                or (exchanges and s.exchange not in exchanges)
+                or s.market_cap_cr < min_mc
+                or s.market_cap_cr > max_mc
+            ):
                 continue
             output.append(s)
         return output
@@ -129,11 +143,13 @@ class PipelineService:
 
         output: list[StockSnapshot] = []
         for s in stocks:
-            if exclude_esm and s.esm_flag:
-                continue
-            if exclude_loss and s.profit_ttm_cr <= 0:
-                continue
-            if s.profit_ttm_cr < min_profit:
+            # Flag and plain comparisons short-circuit before the YoY arithmetic
+            if (
+                (exclude_esm and s.esm_flag)
+                or (exclude_loss and s.profit_ttm_cr <= 0)
+                or s.profit_ttm_cr < min_profit
+                or s.pe > max_pe
+            ):
                 continue
 
             if s.profit_prev_ttm_cr > 0:
@@ -143,8 +159,6 @@ class PipelineService:
 
             if yoy < min_yoy:
                 continue
-            if s.pe > max_pe:
-                continue
 
             output.append(s)
 
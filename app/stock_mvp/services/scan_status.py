@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import threading
+import time
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 
@@ -18,25 +19,53 @@ class ScanProgress:
     message: str = ""         # human-readable status
 
     def to_dict(self) -> dict:
-        return {
-            "running": self.running,
-            "phase": self.phase,
-            "current": self.current,
-            "total": self.total,
-            "symbol": self.symbol,
-            "started_at": self.started_at,
-            "message": self.message,
-            "pct": round(self.current / max(self.total, 1) * 100),
-        }
+        d = _SNAPSHOT_TEMPLATE.copy()
+        d["running"] = self.running
+        d["phase"] = self.phase
+        d["current"] = self.current
+        d["total"] = self.total
+        d["symbol"] = self.symbol
+        d["started_at"] = self.started_at
+        d["message"] = self.message
+        # Integer percentage, rounded half up
+        total = max(self.total, 1)
+        d["pct"] = (self.current * 200 + total) // (2 * total)
+        return d
 
 
+# Key layout of published snapshots; to_dict copies it and fills in values
+_SNAPSHOT_TEMPLATE: dict = {
+    "running": False,
+    "phase": "",
+    "current": 0,
+    "total": 0,
+    "symbol": "",
+    "started_at": "",
+    "message": "",
+    "pct": 0,
+}
+
+# Writers serialize on _lock and publish a fresh dict by rebinding _snapshot; rebinding a
+# module global is atomic, so readers take no lock and never see a half-applied update.
 _lock = threading.Lock()
 _status = ScanProgress()
+_snapshot: dict = _status.to_dict()
+
+# Same-phase progress updates closer together than this are dropped; the UI polls far slower.
+# Phase changes, current reaching the scan total, force=True, start and finish always publish.
+_MIN_PUBLISH_INTERVAL_NS = 100_000_000
+_last_publish_ns = 0
+
+
+def _publish() -> None:
+    global _snapshot, _last_publish_ns
+    _snapshot = _status.to_dict()
+    _last_publish_ns = time.monotonic_ns()
 
 
 def get_scan_status() -> dict:
-    with _lock:
-        return _status.to_dict()
+    """Latest published status. The dict is shared between callers — treat it as read-only."""
+    return _snapshot
 
 
 def start_scan(total: int) -> None:
@@ -48,14 +77,24 @@ def start_scan(total: int) -> None:
         _status.symbol = ""
         _status.started_at = datetime.now(timezone.utc).isoformat()
         _status.message = f"Starting scan of {total} symbols..."
+        _publish()
 
 
-def update_scan(phase: str, current: int, symbol: str = "", message: str = "") -> None:
+def update_scan(phase: str, current: int, symbol: str = "", message: str = "", force: bool = False) -> None:
+    """Record progress; force=True bypasses throttling (e.g. for a phase's last item)."""
+    if (
+        not force
+        and time.monotonic_ns() - _last_publish_ns < _MIN_PUBLISH_INTERVAL_NS
+        and phase == _status.phase
+        and current != _status.total
+    ):
+        return
     with _lock:
         _status.phase = phase
         _status.current = current
         _status.symbol = symbol
         _status.message = message
+        _publish()
 
 
 def finish_scan(message: str = "Scan complete") -> None:
@@ -64,3 +103,4 @@ def finish_scan(message: str = "Scan complete") -> None:
         _status.phase = "done"
         _status.current = _status.total
         _status.message = message
+        _publish()
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
 import logging
+import threading
+from functools import lru_cache
 
+from apscheduler.executors.pool import ThreadPoolExecutor
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
 
@@ -10,8 +13,13 @@ from app.stock_mvp.services.pipeline import PipelineService
 
 logger = logging.getLogger(__name__)
 _scheduler: BackgroundScheduler | None = None
+# start/stop/reload can race (startup vs. concurrent rule saves); holding this across the
+# check-and-start keeps a single live BackgroundScheduler per process.
+_scheduler_lock = threading.RLock()
 
 
+# CronTrigger is immutable once built, so one instance can back jobs across reloads
+@lru_cache(maxsize=32)
 def _trigger_from_cron(cron_expr: str, timezone: str) -> CronTrigger:
     parts = cron_expr.split()
     if len(parts) != 5:
@@ -27,13 +35,12 @@ def _trigger_from_cron(cron_expr: str, timezone: str) -> CronTrigger:
     )
 
 
-def _run_price_refresh() -> None:
+def _run_price_refresh(pipeline_service: PipelineService) -> None:
     """Quick price-only refresh — updates cached prices without full fundamentals scan."""
-    from app.stock_mvp.services.factories import build_provider
     from app.stock_mvp.providers.india_live_provider import IndiaLiveProvider
 
-    rules = load_rules()
-    provider = build_provider(rules)
+    # Reuse the scan's provider so refreshes share its pooled HTTP session
+    provider = pipeline_service.get_provider(load_rules())
 
     if not isinstance(provider, IndiaLiveProvider):
         return
@@ -47,6 +54,11 @@ def _run_price_refresh() -> None:
 
 
 def start_scheduler(pipeline_service: PipelineService) -> BackgroundScheduler:
+    with _scheduler_lock:
+        return _start_scheduler_locked(pipeline_service)
+
+
+def _start_scheduler_locked(pipeline_service: PipelineService) -> BackgroundScheduler:
     global _scheduler
     if _scheduler and _scheduler.running:
         return _scheduler
@@ -58,7 +70,8 @@ def start_scheduler(pipeline_service: PipelineService) -> BackgroundScheduler:
     full_scan_cron = schedules.get("full_scan_cron", "30 16 * * 1-5")
     event_scan_cron = schedules.get("event_scan_cron", "*/30 9-15 * * 1-5")
 
-    scheduler = BackgroundScheduler(timezone=tz)
+    # A bounded pool so a slow price refresh can't starve the scan jobs of a worker
+    scheduler = BackgroundScheduler(timezone=tz, executors={"default": ThreadPoolExecutor(4)})
 
     # Full scan — daily after market close
     scheduler.add_job(
@@ -67,6 +80,8 @@ def start_scheduler(pipeline_service: PipelineService) -> BackgroundScheduler:
         id="full_scan_job",
         replace_existing=True,
         max_instances=1,
+        coalesce=True,
+        misfire_grace_time=300,
     )
 
     # Event scan — periodic during market hours
@@ -76,15 +91,20 @@ def start_scheduler(pipeline_service: PipelineService) -> BackgroundScheduler:
         id="event_scan_job",
         replace_existing=True,
         max_instances=1,
+        coalesce=True,
+        misfire_grace_time=300,
     )
 
     # Price refresh — every 15 minutes during market hours (9:00-15:30 IST, weekdays)
     scheduler.add_job(
         _run_price_refresh,
+        args=(pipeline_service,),
         trigger=CronTrigger(minute="*/15", hour="9-15", day_of_week="mon-fri", timezone=tz),
         id="price_refresh_job",
         replace_existing=True,
         max_instances=1,
+        coalesce=True,
+        misfire_grace_time=60,
     )
 
     scheduler.start()
@@ -96,11 +116,13 @@ def start_scheduler(pipeline_service: PipelineService) -> BackgroundScheduler:
 
 def stop_scheduler() -> None:
     global _scheduler
-    if _scheduler and _scheduler.running:
-        _scheduler.shutdown(wait=False)
-    _scheduler = None
+    with _scheduler_lock:
+        if _scheduler and _scheduler.running:
+            _scheduler.shutdown(wait=False)
+        _scheduler = None
 
 
 def reload_scheduler(pipeline_service: PipelineService) -> BackgroundScheduler:
-    stop_scheduler()
-    return start_scheduler(pipeline_service)
+    with _scheduler_lock:
+        stop_scheduler()
+        return start_scheduler(pipeline_service)
@@ -1,11 +1,61 @@
 from __future__ import annotations
 
-from collections import defaultdict
 from datetime import date
-from typing import Any
+from typing import Any, Sequence
+
+import numpy as np
 
 from app.stock_mvp.models.schemas import ScoredStock, StockEvent, StockSnapshot
-from app.stock_mvp.utils.math_utils import clamp
+
+# Snapshot fields materialised as columns (struct-of-arrays) for the vectorized scorers
+_NUMERIC_FIELDS = (
+    "pe",
+    "profit_ttm_cr",
+    "profit_prev_ttm_cr",
+    "promoter_holding_pct",
+    "hni_net_buying_cr",
+    "pledge_pct",
+)
+_FLAG_FIELDS = ("esm_flag", "governance_flag")
+
+
+def _to_arrays(stocks: list[StockSnapshot]) -> dict[str, np.ndarray]:
+    n = len(stocks)
+    arrays = {
+        name: np.fromiter((getattr(s, name) for s in stocks), dtype=np.float64, count=n)
+        for name in _NUMERIC_FIELDS
+    }
+    for name in _FLAG_FIELDS:
+        arrays[name] = np.fromiter((getattr(s, name) for s in stocks), dtype=bool, count=n)
+    # Quarterly profits are written straight into one row-major (N, 4) buffer, oldest quarter first
+    arrays["quarters"] = np.fromiter(
+        (q for s in stocks for q in (s.profit_q1_cr, s.profit_q2_cr, s.profit_q3_cr, s.profit_q4_cr)),
+        dtype=np.float64,
+        count=4 * n,
+    ).reshape(n, 4)
+    return arrays
+
+
+def _clip(x: np.ndarray, low: float, high: float) -> np.ndarray:
+    # fmin/fmax rather than np.clip so NaN resolves like max(low, min(high, x)) does: to high
+    return np.fmax(low, np.fmin(high, x))
+
+
+def _r2(x: float) -> float:
+    """Round to 2 decimals, half away from zero, by integer scaling instead of round()."""
+    return int(x * 100.0 + (0.5 if x >= 0 else -0.5)) / 100.0
+
+
+def _r2_array(x: np.ndarray) -> np.ndarray:
+    """_r2 over a whole array."""
+    return np.trunc(x * 100.0 + np.copysign(0.5, x)) / 100.0
+
+
+def _yoy_growth_pct(a: dict[str, np.ndarray]) -> np.ndarray:
+    ttm = a["profit_ttm_cr"]
+    prev = a["profit_prev_ttm_cr"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(prev <= 0, np.where(ttm > 0, 100.0, 0.0), ((ttm - prev) / np.abs(prev)) * 100)
 
 
 class ScoreEngine:
@@ -14,46 +64,70 @@ class ScoreEngine:
         self.weights = rules["weights"]
         self.event_weights = rules["event_weights"]
 
-    def score(self, stocks: list[StockSnapshot], events: list[StockEvent]) -> list[ScoredStock]:
-        events_by_symbol: dict[str, list[StockEvent]] = defaultdict(list)
+        # Weights and thresholds are fixed for the engine's lifetime; resolve them once
+        self._w_profit = float(self.weights["profit_trend"])
+        self._w_val = float(self.weights["valuation"])
+        self._w_evt = float(self.weights["future_events"])
+        self._w_qual = float(self.weights["quality"])
+        self._pos_sum = self._w_profit + self._w_val + self._w_evt + self._w_qual
+        self._risk_scale = float(self.weights["risk"]) / 100.0
+        self._max_pe = float(rules["filters"].get("max_pe", 40))
+        self._max_pledge = float(rules["filters"].get("max_pledge_pct", 40))
+        # Event types with a positive weight get a small int code; weights are an array indexed by it,
+        # so events need one hash lookup each and weights are gathered in bulk
+        positive_types = [k for k, v in self.event_weights.items() if float(v) > 0]
+        self._event_type_code = {k: i for i, k in enumerate(positive_types)}
+        self._event_weight_by_code = np.array([float(self.event_weights[k]) for k in positive_types])
+
+    def score(
+        self,
+        stocks: list[StockSnapshot],
+        events: list[StockEvent],
+        top_k: int | None = None,
+    ) -> list[ScoredStock]:
+        """Score and rank stocks, best first; with top_k only the first top_k are built."""
+        if not stocks or (top_k is not None and top_k <= 0):
+            return []
+
+        # Group only events for symbols being scored; stocks without events share one empty tuple
+        wanted = {stock.symbol for stock in stocks}
+        events_by_symbol: dict[str, list[StockEvent]] = {}
         for e in events:
-            events_by_symbol[e.symbol].append(e)
+            if e.symbol in wanted:
+                events_by_symbol.setdefault(e.symbol, []).append(e)
+        no_events: tuple[StockEvent, ...] = ()
+        stock_events = [events_by_symbol.get(stock.symbol, no_events) for stock in stocks]
 
-        scored: list[ScoredStock] = []
-        for stock in stocks:
-            symbol_events = events_by_symbol.get(stock.symbol, [])
-
-            profit_score, profit_reasons = self._profit_trend_score(stock)
-            valuation_score, valuation_reasons = self._valuation_score(stock)
-            event_score, event_reasons = self._future_event_score(stock, symbol_events)
-            quality_score, quality_reasons = self._quality_score(stock)
-            risk_penalty, risk_reasons = self._risk_penalty(stock)
-
-            positive_weight_sum = (
-                float(self.weights["profit_trend"])
-                + float(self.weights["valuation"])
-                + float(self.weights["future_events"])
-                + float(self.weights["quality"])
-            )
+        # Sub-scores are evaluated for every stock at once on column arrays
+        a = _to_arrays(stocks)
+        yoy_growth_pct = _yoy_growth_pct(a)
+        increasing_steps = self._increasing_steps(a)
+
+        profit_score = self._profit_trend_score(yoy_growth_pct, increasing_steps)
+        valuation_score = self._valuation_score(a)
+        quality_score = self._quality_score(a)
+        risk_penalty = self._risk_penalty(a, yoy_growth_pct)
 
-            weighted_positive = (
-                profit_score * float(self.weights["profit_trend"])
-                + valuation_score * float(self.weights["valuation"])
-                + event_score * float(self.weights["future_events"])
-                + quality_score * float(self.weights["quality"])
-            ) / positive_weight_sum
+        event_score = self._future_event_score(stock_events, date.today())
 
-            weighted_risk = risk_penalty * (float(self.weights["risk"]) / 100.0)
-            final_score = clamp(weighted_positive - weighted_risk, 0.0, 100.0)
+        final_score = self._combine(profit_score, valuation_score, event_score, quality_score, risk_penalty)
 
-            reasons = [
-                *profit_reasons,
-                *valuation_reasons,
-                *event_reasons,
-                *quality_reasons,
-                *risk_reasons,
-            ]
+        # Rank on the rounded score, stable, descending — same order as sorting the ScoredStocks
+        neg_rounded = -_r2_array(final_score)
+        order = self._rank(neg_rounded, top_k)
+        rounded = -neg_rounded
 
+        # Only now drop back to per-stock Python work: reasons (including all string formatting)
+        # and result objects, for the ranked rows that are actually returned
+        scored: list[ScoredStock] = []
+        for i in order.tolist():
+            stock = stocks[i]
+            reasons = self._reasons(
+                stock,
+                float(yoy_growth_pct[i]),
+                int(increasing_steps[i]),
+                stock_events[i],
+            )
             scored.append(
                 ScoredStock(
                     symbol=stock.symbol,
@@ -62,118 +136,165 @@ class ScoreEngine:
                     sector=stock.sector,
                     market_cap_cr=stock.market_cap_cr,
                     pe=stock.pe,
-                    final_score=round(final_score, 2),
-                    score_breakdown={
-                        "profit_trend": round(profit_score, 2),
-                        "valuation": round(valuation_score, 2),
-                        "future_events": round(event_score, 2),
-                        "quality": round(quality_score, 2),
-                        "risk_penalty": round(risk_penalty, 2),
-                    },
-                    reasons=reasons[:10],
-                    event_count=len(symbol_events),
+                    final_score=float(rounded[i]),
+                    score_breakdown=(
+                        _r2(float(profit_score[i])),
+                        _r2(float(valuation_score[i])),
+                        _r2(float(event_score[i])),
+                        _r2(float(quality_score[i])),
+                        _r2(float(risk_penalty[i])),
+                    ),
+                    reasons=tuple(reasons[:10]),
+                    event_count=len(stock_events[i]),
                     metrics=stock.metrics,
                 )
             )
 
-        return sorted(scored, key=lambda x: x.final_score, reverse=True)
-
-    def _profit_trend_score(self, stock: StockSnapshot) -> tuple[float, list[str]]:
-        reasons: list[str] = []
-
-        if stock.profit_prev_ttm_cr <= 0:
-            yoy_growth_pct = 100.0 if stock.profit_ttm_cr > 0 else 0.0
-        else:
-            yoy_growth_pct = ((stock.profit_ttm_cr - stock.profit_prev_ttm_cr) / abs(stock.profit_prev_ttm_cr)) * 100
-
-        q = [stock.profit_q1_cr, stock.profit_q2_cr, stock.profit_q3_cr, stock.profit_q4_cr]
-        increasing_steps = sum(1 for i in range(1, len(q)) if q[i] >= q[i - 1])
+        return scored
+
+    def _combine(
+        self,
+        profit_score: np.ndarray,
+        valuation_score: np.ndarray,
+        event_score: np.ndarray,
+        quality_score: np.ndarray,
+        risk_penalty: np.ndarray,
+    ) -> np.ndarray:
+        """Weighted final score, evaluated in place in two buffers rather than one temporary per operator."""
+        out = np.multiply(profit_score, self._w_profit)
+        tmp = np.multiply(valuation_score, self._w_val)
+        out += tmp
+        np.multiply(event_score, self._w_evt, out=tmp)
+        out += tmp
+        np.multiply(quality_score, self._w_qual, out=tmp)
+        out += tmp
+        out /= self._pos_sum
+        np.multiply(risk_penalty, self._risk_scale, out=tmp)
+        out -= tmp
+        np.fmin(out, 100.0, out=out)
+        np.fmax(out, 0.0, out=out)
+        return out
+
+    @staticmethod
+    def _rank(neg_scores: np.ndarray, top_k: int | None) -> np.ndarray:
+        if top_k is None or top_k >= len(neg_scores):
+            return np.argsort(neg_scores, kind="stable")
+        # Partition to the k-th best score, then stable-sort just the candidates (ties included)
+        # so the top_k slice matches a full stable sort exactly.
+        kth = np.partition(neg_scores, top_k - 1)[top_k - 1]
+        candidates = np.flatnonzero(neg_scores <= kth)
+        return candidates[np.argsort(neg_scores[candidates], kind="stable")][:top_k]
+
+    @staticmethod
+    def _increasing_steps(a: dict[str, np.ndarray]) -> np.ndarray:
+        q = a["quarters"]
+        return np.greater_equal(q[:, 1:], q[:, :-1]).sum(axis=1, dtype=np.int8)
+
+    def _profit_trend_score(self, yoy_growth_pct: np.ndarray, increasing_steps: np.ndarray) -> np.ndarray:
         consistency_score = (increasing_steps / 3.0) * 100.0
 
-        growth_score = clamp(yoy_growth_pct, -50, 100)
+        growth_score = _clip(yoy_growth_pct, -50, 100)
         growth_score_normalized = ((growth_score + 50.0) / 150.0) * 100.0
 
-        score = clamp((0.7 * growth_score_normalized) + (0.3 * consistency_score), 0.0, 100.0)
-
-        reasons.append(f"Profit YoY growth: {yoy_growth_pct:.1f}%")
-        reasons.append(f"Quarterly trend consistency: {increasing_steps}/3")
-        return score, reasons
-
-    def _valuation_score(self, stock: StockSnapshot) -> tuple[float, list[str]]:
-        reasons: list[str] = []
-        max_pe = float(self.rules["filters"].get("max_pe", 40))
-
-        if stock.pe <= 0:
-            score = 100.0
-        elif stock.pe <= 20:
-            score = 100.0
-        elif stock.pe <= max_pe:
-            score = clamp(100.0 - ((stock.pe - 20.0) / max(1.0, (max_pe - 20.0))) * 40.0, 45.0, 100.0)
-        else:
-            score = clamp(45.0 - ((stock.pe - max_pe) * 2.0), 0.0, 45.0)
-
-        reasons.append(f"PE: {stock.pe:.1f} (max configured: {max_pe:.1f})")
-        return score, reasons
+        return _clip((0.7 * growth_score_normalized) + (0.3 * consistency_score), 0.0, 100.0)
+
+    def _valuation_score(self, a: dict[str, np.ndarray]) -> np.ndarray:
+        max_pe = self._max_pe
+        pe = a["pe"]
+
+        return np.select(
+            [pe <= 20, pe <= max_pe],
+            [
+                100.0,
+                _clip(100.0 - ((pe - 20.0) / max(1.0, (max_pe - 20.0))) * 40.0, 45.0, 100.0),
+            ],
+            default=_clip(45.0 - ((pe - max_pe) * 2.0), 0.0, 45.0),
+        )
+
+    def _future_event_score(
+        self, stock_events: list[Sequence[StockEvent]], today: date
+    ) -> np.ndarray:
+        """Per-stock event scores."""
+        type_code_get = self._event_type_code.get
+        owners: list[int] = []
+        codes: list[int] = []
+        ordinals: list[int] = []
+
+        # One flat pass collects (stock, event type, date) for every weighted event...
+        for i, events in enumerate(stock_events):
+            for e in events:
+                code = type_code_get(e.event_type)
+                if code is not None:
+                    owners.append(i)
+                    codes.append(code)
+                    ordinals.append(e.event_date.toordinal())
+
+        # ...then recency and the per-stock sums are array ops. bincount accumulates each stock's
+        # events in input order, matching a running scalar sum.
+        age_days = np.maximum(today.toordinal() - np.array(ordinals, dtype=np.int64), 0)
+        recency = np.fmax(0.35, np.fmin(1.0, 1.0 - (age_days / 90.0)))
+        raw = np.bincount(
+            np.array(owners, dtype=np.intp),
+            weights=self._event_weight_by_code[np.array(codes, dtype=np.intp)] * recency,
+            minlength=len(stock_events),
+        )
+        return _clip(raw, 0.0, 100.0)
+
+    def _quality_score(self, a: dict[str, np.ndarray]) -> np.ndarray:
+        promoter_score = _clip((a["promoter_holding_pct"] / 75.0) * 100.0, 0.0, 100.0)
+        hni_score = _clip((a["hni_net_buying_cr"] / 20.0) * 100.0, 0.0, 100.0)
+        pledge_penalty = _clip((a["pledge_pct"] / 50.0) * 100.0, 0.0, 100.0)
+
+        return _clip((0.55 * promoter_score) + (0.45 * hni_score) - (0.35 * pledge_penalty), 0.0, 100.0)
+
+    def _risk_penalty(self, a: dict[str, np.ndarray], yoy_growth_pct: np.ndarray) -> np.ndarray:
+        max_pledge = self._max_pledge
+
+        penalty = (
+            np.where(a["esm_flag"], 50.0, 0.0)
+            + np.where(a["governance_flag"], 35.0, 0.0)
+            + np.where(a["pledge_pct"] > max_pledge, 25.0, 0.0)
+            + np.where((a["profit_prev_ttm_cr"] > 0) & (yoy_growth_pct < -30), 30.0, 0.0)
+        )
+        return _clip(penalty, 0.0, 100.0)
+
+    def _reasons(
+        self,
+        stock: StockSnapshot,
+        yoy_growth_pct: float,
+        increasing_steps: int,
+        events: Sequence[StockEvent],
+    ) -> list[str]:
+        max_pe = self._max_pe
+        max_pledge = self._max_pledge
+
+        reasons = [
+            f"Profit YoY growth: {yoy_growth_pct:.1f}%",
+            f"Quarterly trend consistency: {increasing_steps}/3",
+            f"PE: {stock.pe:.1f} (max configured: {max_pe:.1f})",
+        ]
 
-    def _future_event_score(self, stock: StockSnapshot, events: list[StockEvent]) -> tuple[float, list[str]]:
-        reasons: list[str] = []
         if not events:
-            return 0.0, ["No recent qualifying events"]
-
-        raw = 0.0
-        top_events: list[str] = []
-
-        for e in events:
-            base = float(self.event_weights.get(e.event_type, 0))
-            if base <= 0:
-                continue
-            age_days = max(0, (date.today() - e.event_date).days)
-            recency = clamp(1.0 - (age_days / 90.0), 0.35, 1.0)
-            raw += base * recency
-            top_events.append(f"{e.event_type} ({e.event_date.isoformat()})")
-
-        score = clamp(raw, 0.0, 100.0)
-        if top_events:
-            reasons.append("Recent events: " + ", ".join(top_events[:3]))
-        return score, reasons
-
-    def _quality_score(self, stock: StockSnapshot) -> tuple[float, list[str]]:
-        reasons: list[str] = []
-
-        promoter_score = clamp((stock.promoter_holding_pct / 75.0) * 100.0, 0.0, 100.0)
-        hni_score = clamp((stock.hni_net_buying_cr / 20.0) * 100.0, 0.0, 100.0)
-        pledge_penalty = clamp((stock.pledge_pct / 50.0) * 100.0, 0.0, 100.0)
-
-        score = clamp((0.55 * promoter_score) + (0.45 * hni_score) - (0.35 * pledge_penalty), 0.0, 100.0)
+            reasons.append("No recent qualifying events")
+        else:
+            weighted = [e for e in events if e.event_type in self._event_type_code][:3]
+            if weighted:
+                reasons.append(
+                    "Recent events: " + ", ".join(f"{e.event_type} ({e.event_date.isoformat()})" for e in weighted)
+                )
 
         reasons.append(f"Promoter holding: {stock.promoter_holding_pct:.1f}%")
         reasons.append(f"HNI net buying: {stock.hni_net_buying_cr:.1f} cr")
         if stock.pledge_pct > 0:
             reasons.append(f"Pledge: {stock.pledge_pct:.1f}%")
 
-        return score, reasons
-
-    def _risk_penalty(self, stock: StockSnapshot) -> tuple[float, list[str]]:
-        reasons: list[str] = []
-        penalty = 0.0
-
         if stock.esm_flag:
-            penalty += 50.0
             reasons.append("Risk: ESM/ASM-like flag present")
-
         if stock.governance_flag:
-            penalty += 35.0
             reasons.append("Risk: governance red flag")
-
-        max_pledge = float(self.rules["filters"].get("max_pledge_pct", 40))
         if stock.pledge_pct > max_pledge:
-            penalty += 25.0
             reasons.append(f"Risk: pledge above threshold ({stock.pledge_pct:.1f}% > {max_pledge:.1f}%)")
+        if stock.profit_prev_ttm_cr > 0 and yoy_growth_pct < -30:
+            reasons.append(f"Risk: sharp profit drop ({yoy_growth_pct:.1f}%)")
 
-        if stock.profit_prev_ttm_cr > 0:
-            yoy_growth_pct = ((stock.profit_ttm_cr - stock.profit_prev_ttm_cr) / abs(stock.profit_prev_ttm_cr)) * 100
-            if yoy_growth_pct < -30:
-                penalty += 30.0
-                reasons.append(f"Risk: sharp profit drop ({yoy_growth_pct:.1f}%)")
-
-        return clamp(penalty, 0.0, 100.0), reasons
+        return reasons
@@ -1,5 +0,0 @@
-from __future__ import annotations
-
-
-def clamp(value: float, low: float, high: float) -> float:
-    return max(low, min(high, value))